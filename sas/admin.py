@@ -4,15 +4,18 @@ from .models import AnalyzedString
 @admin.register(AnalyzedString)
 class AnalyzedStringAdmin(admin.ModelAdmin):
     list_display = ('value', 'length', 'is_palindrome', 'unique_characters', 'word_count', 'created_at')
-    list_filter = ('is_palindrome', 'length', 'word_count', 'created_at')
+    list_filter = ('is_palindrome', 'length', 'word_count', 'analyzer_version', 'created_at')
     search_fields = ('value',)
-    readonly_fields = ('id', 'created_at')
+    readonly_fields = ('id', 'created_at', 'character_frequency')
     
     fieldsets = (
         ('Basic Information', {
             'fields': ('id', 'value', 'created_at')
         }),
         ('Analysis Results', {
-            'fields': ('length', 'is_palindrome', 'unique_characters', 'word_count', 'character_frequency_map')
+            'fields': ('length', 'is_palindrome', 'unique_characters', 'word_count', 'character_frequency', 'analyzer_version')
         }),
-    )
\ No newline at end of file
+    )
+
+    def character_frequency(self, obj):
+        return obj.get_character_frequency()
@@ -0,0 +1,69 @@
+import json
+import random
+import timeit
+from collections import Counter
+
+from django.core.management.base import BaseCommand, CommandError
+
+from sas.models import AnalyzedString
+from sas.utils import encode_character_frequency, decode_character_frequency
+
+ALPHABETS = {
+    'ascii': [chr(c) for c in range(32, 127)],
+    'latin': [chr(c) for c in range(32, 0x250)],
+    'cjk': [chr(c) for c in range(0x4E00, 0x4E00 + 3000)] + [' '],
+}
+
+
+def sample_corpus(size, max_length, alphabet, seed=0):
+    rng = random.Random(seed)
+    chars = ALPHABETS[alphabet]
+    return [''.join(rng.choices(chars, k=rng.randint(1, max_length))) for _ in range(size)]
+
+
+class Command(BaseCommand):
+    help = "Compare size and encode/decode speed of JSON and binary character frequency maps"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--from-db', action='store_true',
+                            help="Benchmark the stored strings instead of a generated corpus")
+        parser.add_argument('--size', type=int, default=2000,
+                            help="Number of generated strings")
+        parser.add_argument('--max-length', type=int, default=1000,
+                            help="Maximum generated string length")
+        parser.add_argument('--alphabet', choices=sorted(ALPHABETS), default='ascii')
+        parser.add_argument('--repeat', type=int, default=5,
+                            help="Timing repetitions, the best is reported")
+
+    def handle(self, *args, **options):
+        if options['from_db']:
+            texts = list(AnalyzedString.objects.values_list('value', flat=True))
+        else:
+            texts = sample_corpus(options['size'], options['max_length'], options['alphabet'])
+        if not texts:
+            raise CommandError("No strings to benchmark")
+
+        maps = [dict(Counter(text)) for text in texts]
+        as_json = [json.dumps(freq) for freq in maps]
+        as_binary = [encode_character_frequency(freq) for freq in maps]
+        for text, freq, data in zip(texts, maps, as_binary):
+            if decode_character_frequency(data) != freq:
+                raise CommandError(f"Binary encoding does not round-trip for {text[:40]!r}")
+
+        def best(func, data):
+            return min(timeit.repeat(lambda: [func(item) for item in data], number=1,
+                                     repeat=options['repeat'])) / len(data) * 1e6
+
+        json_size = sum(len(data.encode()) for data in as_json) / len(texts)
+        binary_size = sum(len(data) for data in as_binary) / len(texts)
+        rows = [
+            ('json', json_size, best(json.dumps, maps), best(json.loads, as_json)),
+            ('binary', binary_size, best(encode_character_frequency, maps),
+             best(decode_character_frequency, as_binary)),
+        ]
+
+        self.stdout.write(f"{len(texts)} strings, average {sum(map(len, texts)) / len(texts):.0f} characters")
+        self.stdout.write(f"{'format':<8}{'avg bytes':>12}{'encode us':>12}{'decode us':>12}")
+        for name, size, encode, decode in rows:
+            self.stdout.write(f"{name:<8}{size:>12.1f}{encode:>12.2f}{decode:>12.2f}")
+        self.stdout.write(f"Binary is {binary_size / json_size:.0%} of the JSON size")
@@ -0,0 +1,397 @@
+import asyncio
+import importlib.util
+import json
+import math
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from urllib.parse import quote, urlencode
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+MANAGE_PY = settings.BASE_DIR / 'manage.py'
+
+ENDPOINTS = ('create', 'get', 'list', 'nl')
+
+DEFAULT_MIX = 'create=2,get=4,list=2,nl=1'
+
+LIST_FILTERS = [
+    {'is_palindrome': 'true'},
+    {'is_palindrome': 'false', 'min_length': 5},
+    {'min_length': 3, 'max_length': 20},
+    {'word_count': 2},
+    {'contains_character': 'a'},
+]
+
+NL_QUERIES = [
+    'all single word palindromic strings',
+    'strings longer than 10 characters',
+    'strings containing the letter z',
+    'palindromic strings that contain a vowel',
+]
+
+WORDS = ['alpha', 'level', 'radar', 'zebra', 'hello', 'world', 'kayak', 'noon', 'test', 'madam']
+
+
+def parse_mix(spec):
+    """Parse 'create=2,get=4' into {endpoint: weight}."""
+    mix = {}
+    for part in spec.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise ValueError(f"Unknown endpoint '{name}', expected one of {', '.join(ENDPOINTS)}")
+        try:
+            mix[name] = float(weight) if weight else 1.0
+        except ValueError:
+            raise ValueError(f"Weight for '{name}' must be a number")
+        if mix[name] < 0:
+            raise ValueError(f"Weight for '{name}' must not be negative")
+    if not any(mix.values()):
+        raise ValueError("Mix must give at least one endpoint a positive weight")
+    return mix
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(samples, elapsed):
+    """Aggregate (endpoint, status, latency) samples into per-endpoint stats.
+
+    status is None when the request failed at the transport level.
+    """
+    grouped = {endpoint: [] for endpoint in ENDPOINTS}
+    for endpoint, status, latency in samples:
+        grouped.setdefault(endpoint, []).append((status, latency))
+    grouped['total'] = [(status, latency) for _, status, latency in samples]
+
+    report = {}
+    for endpoint, rows in grouped.items():
+        if not rows and endpoint != 'total':
+            continue
+        latencies = sorted(latency for _, latency in rows)
+        errors = sum(1 for status, _ in rows if status is None or status >= 500)
+        non_2xx = sum(1 for status, _ in rows if status is None or not 200 <= status < 300)
+        count = len(rows)
+        report[endpoint] = {
+            'requests': count,
+            'throughput': count / elapsed if elapsed else 0.0,
+            'p50_ms': _ms(percentile(latencies, 50)),
+            'p95_ms': _ms(percentile(latencies, 95)),
+            'p99_ms': _ms(percentile(latencies, 99)),
+            'error_rate': errors / count if count else 0.0,
+            'non_2xx_rate': non_2xx / count if count else 0.0,
+        }
+    return report
+
+
+def find_saturation(steps, min_gain, max_error_rate):
+    """Return the concurrency at which throughput stops scaling.
+
+    steps is a list of (concurrency, total_stats). The saturation point is the
+    last step that still improved throughput by at least min_gain over the
+    best step before it, and did not exceed max_error_rate.
+    """
+    saturation = None
+    best = 0.0
+    for concurrency, stats in steps:
+        if stats['error_rate'] > max_error_rate:
+            break
+        if saturation is not None and stats['throughput'] < best * (1 + min_gain):
+            break
+        saturation = concurrency
+        best = max(best, stats['throughput'])
+    return saturation
+
+
+def _ms(seconds):
+    return None if seconds is None else round(seconds * 1000, 2)
+
+
+class Command(BaseCommand):
+    help = (
+        "Run a local load test against the string analysis API and report latency percentiles. "
+        "The server runs in a separate process on this machine, so the load generator still "
+        "competes with it for CPU."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--server', choices=['wsgi', 'asgi'], default='wsgi',
+                            help="Application interface to serve: runserver for wsgi, uvicorn for asgi")
+        parser.add_argument('--concurrency', type=int, default=16,
+                            help="Number of concurrent clients")
+        parser.add_argument('--duration', type=float, default=10.0,
+                            help="Seconds to run each load phase")
+        parser.add_argument('--mix', default=DEFAULT_MIX,
+                            help=f"Weighted endpoint mix (default: {DEFAULT_MIX})")
+        parser.add_argument('--seed-strings', type=int, default=100,
+                            help="Strings to create before measuring")
+        parser.add_argument('--steps',
+                            help="Comma separated concurrency levels for stepped mode, e.g. 1,2,4,8,16")
+        parser.add_argument('--min-gain', type=float, default=0.05,
+                            help="Minimum relative throughput gain for a step to count as scaling")
+        parser.add_argument('--max-error-rate', type=float, default=0.01,
+                            help="Error rate above which a step counts as saturated")
+        parser.add_argument('--timeout', type=float, default=10.0,
+                            help="Per-request timeout in seconds")
+        parser.add_argument('--random-seed', type=int, default=0)
+        parser.add_argument('--json', action='store_true',
+                            help="Print results as JSON")
+
+    def handle(self, *args, **options):
+        try:
+            mix = parse_mix(options['mix'])
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        if options['steps']:
+            try:
+                steps = [int(step) for step in options['steps'].split(',') if step.strip()]
+            except ValueError:
+                raise CommandError("--steps must be a comma separated list of integers")
+        else:
+            steps = [options['concurrency']]
+        if not steps or min(steps) < 1:
+            raise CommandError("Concurrency must be at least 1")
+
+        tmpdir = tempfile.mkdtemp(prefix='sas-loadtest-')
+        try:
+            env = self._prepare_database(tmpdir)
+            host, port, stop_server = self._start_server(options['server'], env, tmpdir)
+            try:
+                results = asyncio.run(self._run(host, port, mix, steps, options))
+            finally:
+                stop_server()
+        finally:
+            shutil.rmtree(tmpdir, ignore_errors=True)
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+        else:
+            self._print_results(results)
+
+        # An endpoint that never succeeds is measuring an error path, not the
+        # endpoint, so refuse to let that pass as a result.
+        broken = sorted({
+            endpoint
+            for step in results['steps']
+            for endpoint, stats in step['endpoints'].items()
+            if endpoint != 'total' and stats['non_2xx_rate'] == 1.0
+        })
+        if broken:
+            raise CommandError(f"Every request to {', '.join(broken)} returned a non-2xx status")
+
+    def _prepare_database(self, tmpdir):
+        # Never load test the real database: the server gets a fresh SQLite
+        # file, migrated in a subprocess with the same environment it will use.
+        env = dict(os.environ, DATABASE_PATH=os.path.join(tmpdir, 'loadtest.sqlite3'), DEBUG='False')
+        migrate = subprocess.run(
+            [sys.executable, str(MANAGE_PY), 'migrate', '--noinput', '-v', '0'],
+            env=env, capture_output=True, text=True,
+        )
+        if migrate.returncode:
+            raise CommandError(f"Could not migrate the load test database:\n{migrate.stderr}")
+        return env
+
+    def _start_server(self, kind, env, tmpdir):
+        # The server runs in its own process so that it does not share a GIL
+        # with the load generator and skew the latencies it reports.
+        host = '127.0.0.1'
+        with socket.socket() as sock:
+            sock.bind((host, 0))
+            port = sock.getsockname()[1]
+
+        if kind == 'asgi':
+            if importlib.util.find_spec('uvicorn') is None:
+                raise CommandError("--server asgi requires uvicorn to be installed")
+            command = [sys.executable, '-m', 'uvicorn', 'server.asgi:application',
+                       '--host', host, '--port', str(port), '--log-level', 'warning',
+                       '--lifespan', 'off', '--backlog', '1024']
+        else:
+            command = [sys.executable, str(MANAGE_PY), 'runserver', f"{host}:{port}",
+                       '--noreload', '--skip-checks']
+
+        log_path = os.path.join(tmpdir, 'server.log')
+        log = open(log_path, 'w')
+        process = subprocess.Popen(command, cwd=str(MANAGE_PY.parent), env=env,
+                                   stdout=log, stderr=subprocess.STDOUT)
+
+        def stop():
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+            log.close()
+
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                socket.create_connection((host, port), timeout=1).close()
+                break
+            except OSError:
+                if process.poll() is not None or time.monotonic() > deadline:
+                    stop()
+                    with open(log_path) as f:
+                        output = f.read()
+                    raise CommandError(f"{kind.upper()} server failed to start:\n{output}")
+                time.sleep(0.1)
+        return host, port, stop
+
+    async def _run(self, host, port, mix, steps, options):
+        client = _Client(host, port, options['timeout'])
+        rng = random.Random(options['random_seed'])
+
+        known_values = []
+        for _ in range(options['seed_strings']):
+            value = client.new_value(rng)
+            status, _ = await client.request('POST', '/strings/', {'value': value})
+            if status == 201:
+                known_values.append(value)
+
+        results = {
+            'server': options['server'],
+            'mix': mix,
+            'duration': options['duration'],
+            'steps': [],
+        }
+        for concurrency in steps:
+            samples, elapsed = await self._phase(client, mix, concurrency, options, known_values)
+            results['steps'].append({
+                'concurrency': concurrency,
+                'elapsed': round(elapsed, 3),
+                'endpoints': summarize(samples, elapsed),
+            })
+
+        if len(steps) > 1:
+            results['saturation_concurrency'] = find_saturation(
+                [(step['concurrency'], step['endpoints']['total']) for step in results['steps']],
+                options['min_gain'],
+                options['max_error_rate'],
+            )
+        return results
+
+    async def _phase(self, client, mix, concurrency, options, known_values):
+        names = list(mix)
+        weights = [mix[name] for name in names]
+        samples = []
+        # Requests in flight at the deadline still complete and are counted,
+        # so throughput is measured against the time the phase really took.
+        started = time.monotonic()
+        deadline = started + options['duration']
+
+        async def worker(worker_id):
+            rng = random.Random(f"{options['random_seed']}-{concurrency}-{worker_id}")
+            while time.monotonic() < deadline:
+                endpoint = rng.choices(names, weights)[0]
+                method, path, body = client.build(endpoint, rng, known_values)
+                status, latency = await client.request(method, path, body)
+                samples.append((endpoint, status, latency))
+                if endpoint == 'create' and status == 201:
+                    known_values.append(body['value'])
+
+        await asyncio.gather(*(worker(i) for i in range(concurrency)))
+        return samples, time.monotonic() - started
+
+    def _print_results(self, results):
+        self.stdout.write(f"Server: {results['server']}, target duration per step: {results['duration']}s")
+        header = f"{'endpoint':<10}{'requests':>10}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>9}{'non-2xx':>9}"
+        for step in results['steps']:
+            self.stdout.write('')
+            self.stdout.write(f"Concurrency {step['concurrency']} ({step['elapsed']}s)")
+            self.stdout.write(header)
+            for endpoint, stats in step['endpoints'].items():
+                self.stdout.write(
+                    f"{endpoint:<10}{stats['requests']:>10}{stats['throughput']:>10.1f}"
+                    f"{_fmt(stats['p50_ms']):>10}{_fmt(stats['p95_ms']):>10}{_fmt(stats['p99_ms']):>10}"
+                    f"{stats['error_rate']:>9.1%}{stats['non_2xx_rate']:>9.1%}"
+                )
+        if 'saturation_concurrency' in results:
+            self.stdout.write('')
+            if results['saturation_concurrency'] is None:
+                self.stdout.write(self.style.WARNING("Saturated at the first step"))
+            else:
+                self.stdout.write(self.style.SUCCESS(
+                    f"Throughput stops scaling after concurrency {results['saturation_concurrency']}"
+                ))
+
+
+def _fmt(value):
+    return '-' if value is None else f"{value:.2f}"
+
+
+class _Client:
+    """Minimal HTTP/1.1 client on asyncio streams, one connection per request."""
+
+    def __init__(self, host, port, timeout):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.counter = 0
+
+    def new_value(self, rng):
+        self.counter += 1
+        words = rng.sample(WORDS, rng.randint(1, 3))
+        if rng.random() < 0.2:
+            # Palindromes keep the is_palindrome filters returning data.
+            word = rng.choice(WORDS) + str(self.counter)
+            return word + word[::-1]
+        return ' '.join(words) + f" {self.counter}"
+
+    def build(self, endpoint, rng, known_values):
+        if endpoint == 'create':
+            return 'POST', '/strings/', {'value': self.new_value(rng)}
+        if endpoint == 'get':
+            value = rng.choice(known_values) if known_values else 'missing'
+            return 'GET', f"/strings/{quote(value, safe='')}/", None
+        if endpoint == 'list':
+            return 'GET', f"/strings-list/?{urlencode(rng.choice(LIST_FILTERS))}", None
+        query = urlencode({'query': rng.choice(NL_QUERIES)})
+        return 'GET', f"/strings/filter-by-natural-language/?{query}", None
+
+    async def request(self, method, path, body=None):
+        start = time.perf_counter()
+        try:
+            status = await asyncio.wait_for(self._send(method, path, body), self.timeout)
+        except (OSError, asyncio.TimeoutError, ValueError, IndexError):
+            status = None
+        return status, time.perf_counter() - start
+
+    async def _send(self, method, path, body):
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        try:
+            payload = json.dumps(body).encode() if body is not None else b''
+            head = (
+                f"{method} {path} HTTP/1.1\r\n"
+                f"Host: {self.host}:{self.port}\r\n"
+                "Connection: close\r\n"
+                "Accept: application/json\r\n"
+            )
+            if body is not None:
+                head += f"Content-Type: application/json\r\nContent-Length: {len(payload)}\r\n"
+            writer.write(head.encode() + b"\r\n" + payload)
+            await writer.drain()
+            status_line = await reader.readline()
+            await reader.read()
+            return int(status_line.split()[1])
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
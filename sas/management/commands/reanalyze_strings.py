@@ -0,0 +1,107 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+
+from sas.models import AnalyzedString
+from sas.utils import analyze_string, ANALYZER_VERSION
+
+UPDATE_FIELDS = [
+    'length',
+    'is_palindrome',
+    'unique_characters',
+    'word_count',
+    'character_frequency_map',
+    'analyzer_version',
+]
+
+
+def reanalyze_chunk(rows, analyses):
+    """Apply fresh analyses to rows in place, returning the rows."""
+    for row, properties in zip(rows, analyses):
+        row.length = properties['length']
+        row.is_palindrome = properties['is_palindrome']
+        row.unique_characters = properties['unique_characters']
+        row.word_count = properties['word_count']
+        row.set_character_frequency(properties['character_frequency_map'])
+        row.analyzer_version = ANALYZER_VERSION
+    return rows
+
+
+class Command(BaseCommand):
+    help = "Re-analyze stored strings whose analyzer_version is older than the current analyzer"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=500,
+                            help="Rows fetched and written per chunk")
+        parser.add_argument('--workers', type=int, default=0,
+                            help="Worker processes for analysis (0 analyzes in this process)")
+        parser.add_argument('--max-rows-per-second', type=float, default=0,
+                            help="Throttle to at most this many rows per second (0 disables)")
+        parser.add_argument('--after', default='',
+                            help="Resume after this primary key, as printed in the progress output")
+        parser.add_argument('--limit', type=int, default=0,
+                            help="Stop after this many rows (0 processes everything)")
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        if chunk_size < 1:
+            raise CommandError("--chunk-size must be at least 1")
+        if options['workers'] < 0:
+            raise CommandError("--workers must not be negative")
+
+        # Rows already at the current version are skipped, so rerunning after
+        # an interruption only picks up what is left; --after saves the rescan.
+        stale = AnalyzedString.objects.filter(analyzer_version__lt=ANALYZER_VERSION).order_by('pk')
+        if options['after']:
+            stale = stale.filter(pk__gt=options['after'])
+
+        total = stale.count()
+        if options['limit']:
+            total = min(total, options['limit'])
+        if not total:
+            self.stdout.write(f"All strings are at analyzer version {ANALYZER_VERSION}")
+            return
+
+        self.stdout.write(f"Re-analyzing {total} strings to analyzer version {ANALYZER_VERSION}")
+        pool = ProcessPoolExecutor(options['workers']) if options['workers'] else None
+        try:
+            self._backfill(stale, total, chunk_size, pool, options['max_rows_per_second'])
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+    def _backfill(self, stale, total, chunk_size, pool, max_rate):
+        done = 0
+        last_pk = None
+        started = time.monotonic()
+
+        while done < total:
+            chunk = stale if last_pk is None else stale.filter(pk__gt=last_pk)
+            rows = list(chunk.only('pk', 'value')[:min(chunk_size, total - done)])
+            if not rows:
+                break
+
+            values = [row.value for row in rows]
+            if pool is not None:
+                analyses = list(pool.map(analyze_string, values, chunksize=max(1, len(values) // 16)))
+            else:
+                analyses = [analyze_string(value) for value in values]
+
+            AnalyzedString.objects.bulk_update(reanalyze_chunk(rows, analyses), UPDATE_FIELDS)
+            done += len(rows)
+            last_pk = rows[-1].pk
+
+            elapsed = time.monotonic() - started
+            rate = done / elapsed if elapsed else 0
+            self.stdout.write(
+                f"{done}/{total} ({done / total:.0%}) {rate:.0f} rows/s, last pk {last_pk}"
+            )
+
+            if max_rate:
+                # Sleep until the average rate is back under the limit.
+                delay = done / max_rate - (time.monotonic() - started)
+                if delay > 0:
+                    time.sleep(delay)
+
+        self.stdout.write(self.style.SUCCESS(f"Re-analyzed {done} strings"))
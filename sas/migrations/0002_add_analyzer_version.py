@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-19 16:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sas', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='analyzedstring',
+            name='analyzer_version',
+            field=models.IntegerField(db_index=True, default=1),
+        ),
+    ]
@@ -0,0 +1,120 @@
+import json
+import zlib
+
+from django.db import migrations, models
+
+CHUNK_SIZE = 1000
+
+# Frozen copy of the encoding as of this migration, so replaying it is not
+# affected by later changes to sas.utils. Rows are written uncompressed.
+ZLIB = 0x01
+VARINT_COUNTS = 0x02
+
+
+def write_varint(out, n):
+    while n >= 0x80:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def read_varint(data, pos):
+    n = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        n |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return n, pos
+        shift += 7
+
+
+def encode(freq_dict):
+    characters = ''.join(freq_dict).encode('utf-8', 'surrogatepass')
+    body = bytearray()
+    write_varint(body, len(characters))
+    body += characters
+    flags = VARINT_COUNTS if any(count > 0xFF for count in freq_dict.values()) else 0
+    for count in freq_dict.values():
+        if flags:
+            write_varint(body, count)
+        else:
+            body.append(count)
+    return bytes([flags]) + body
+
+
+def decode(data):
+    data = bytes(data)
+    if not data:
+        return {}
+    body = zlib.decompress(data[1:]) if data[0] & ZLIB else data[1:]
+    size, pos = read_varint(body, 0)
+    characters = body[pos:pos + size].decode('utf-8', 'surrogatepass')
+    pos += size
+    if data[0] & VARINT_COUNTS:
+        counts = []
+        while pos < len(body):
+            count, pos = read_varint(body, pos)
+            counts.append(count)
+    else:
+        counts = body[pos:]
+    return dict(zip(characters, counts))
+
+
+def convert_in_chunks(apps, source, target, convert):
+    AnalyzedString = apps.get_model('sas', 'AnalyzedString')
+    rows = AnalyzedString.objects.order_by('pk').only('pk', source)
+
+    last_pk = None
+    while True:
+        chunk = rows if last_pk is None else rows.filter(pk__gt=last_pk)
+        chunk = list(chunk[:CHUNK_SIZE])
+        if not chunk:
+            break
+        for row in chunk:
+            setattr(row, target, convert(getattr(row, source)))
+        AnalyzedString.objects.bulk_update(chunk, [target])
+        last_pk = chunk[-1].pk
+
+
+def encode_frequency_maps(apps, schema_editor):
+    convert_in_chunks(apps, 'character_frequency_map', 'character_frequency_blob',
+                      lambda value: encode(json.loads(value)))
+
+
+def decode_frequency_maps(apps, schema_editor):
+    convert_in_chunks(apps, 'character_frequency_blob', 'character_frequency_map',
+                      lambda value: json.dumps(decode(value)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sas', '0002_add_analyzer_version'),
+    ]
+
+    operations = [
+        # Gives the JSON column a default so that unapplying RemoveField below
+        # can re-add it to a table that already has rows.
+        migrations.AlterField(
+            model_name='analyzedstring',
+            name='character_frequency_map',
+            field=models.TextField(default=''),
+        ),
+        migrations.AddField(
+            model_name='analyzedstring',
+            name='character_frequency_blob',
+            field=models.BinaryField(default=b''),
+            preserve_default=False,
+        ),
+        migrations.RunPython(encode_frequency_maps, decode_frequency_maps),
+        migrations.RemoveField(
+            model_name='analyzedstring',
+            name='character_frequency_map',
+        ),
+        migrations.RenameField(
+            model_name='analyzedstring',
+            old_name='character_frequency_blob',
+            new_name='character_frequency_map',
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.7 on 2026-10-19 17:07
+
+import sas.utils
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sas', '0003_binary_character_frequency_map'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='analyzedstring',
+            name='analyzer_version',
+            field=models.IntegerField(db_index=True, default=sas.utils.current_analyzer_version),
+        ),
+    ]
@@ -1,5 +1,5 @@
 from django.db import models
-import json
+from .utils import encode_character_frequency, decode_character_frequency, current_analyzer_version
 
 class AnalyzedString(models.Model):
     id = models.CharField(max_length=64, primary_key=True)  
@@ -8,14 +8,22 @@ class AnalyzedString(models.Model):
     is_palindrome = models.BooleanField()
     unique_characters = models.IntegerField()
     word_count = models.IntegerField()
-    character_frequency_map = models.TextField()  
+    character_frequency_map = models.BinaryField()
+    analyzer_version = models.IntegerField(default=current_analyzer_version, db_index=True)
     created_at = models.DateTimeField(auto_now_add=True)
     
     def set_character_frequency(self, freq_dict):
-        self.character_frequency_map = json.dumps(freq_dict)
+        self.character_frequency_map = encode_character_frequency(freq_dict)
+        self._character_frequency_cache = (self.character_frequency_map, dict(freq_dict))
     
     def get_character_frequency(self):
-        return json.loads(self.character_frequency_map)
+        # Decoded maps are cached per instance, keyed on the raw value so a
+        # direct assignment to character_frequency_map is never served stale.
+        cached = getattr(self, '_character_frequency_cache', None)
+        if cached is None or cached[0] != self.character_frequency_map:
+            cached = (self.character_frequency_map, decode_character_frequency(self.character_frequency_map))
+            self._character_frequency_cache = cached
+        return dict(cached[1])
     
     class Meta:
         db_table = 'analyzed_strings'
\ No newline at end of file
@@ -3,7 +3,13 @@ from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
 from .models import AnalyzedString
-from .utils import analyze_string
+from .utils import (
+    analyze_string,
+    encode_character_frequency,
+    decode_character_frequency,
+    ANALYZER_VERSION,
+    FREQUENCY_ZLIB,
+)
 import json
 
 class StringAnalysisUtilsTests(TestCase):
@@ -27,6 +33,29 @@ class StringAnalysisUtilsTests(TestCase):
         result = analyze_string("hello world test")
         self.assertEqual(result['word_count'], 3)
 
+class CharacterFrequencyEncodingTests(TestCase):
+    def test_round_trip(self):
+        """Test that encoded frequency maps decode to the original dict"""
+        for text in ['', 'hello', 'A man a plan a canal Panama', 'ñandú 日本語 😀😀', 'a' * 5000, 'ab' * 300]:
+            freq = analyze_string(text)['character_frequency_map']
+            decoded = decode_character_frequency(encode_character_frequency(freq))
+            self.assertEqual(decoded, freq)
+            self.assertEqual(list(decoded), list(freq))
+
+    def test_large_alphabet_is_compressed(self):
+        """Test zlib is used for large alphabets when it saves space"""
+        freq = {chr(0x4E00 + i): 1 for i in range(500)}
+        data = encode_character_frequency(freq)
+
+        self.assertTrue(data[0] & FREQUENCY_ZLIB)
+        self.assertLess(len(data), len(json.dumps(freq)))
+        self.assertEqual(decode_character_frequency(data), freq)
+
+    def test_unknown_encoding(self):
+        """Test that an unknown header byte is rejected"""
+        with self.assertRaises(ValueError):
+            decode_character_frequency(b'\x07\x00')
+
 class StringAnalysisAPITests(APITestCase):
     def setUp(self):
         """Set up test data"""
@@ -44,6 +73,10 @@ class StringAnalysisAPITests(APITestCase):
         self.assertEqual(response.data['value'], self.test_string)
         self.assertIn('properties', response.data)
         self.assertIn('id', response.data)
+        self.assertEqual(
+            AnalyzedString.objects.get(id=response.data['id']).analyzer_version,
+            ANALYZER_VERSION
+        )
     
     def test_create_analyze_string_duplicate(self):
         """Test duplicate string detection"""
@@ -152,5 +185,107 @@ class ModelTests(TestCase):
         freq_map = string_obj.get_character_frequency()
         self.assertEqual(freq_map['l'], 2)
         self.assertIsInstance(freq_map, dict)
+        self.assertIsInstance(string_obj.character_frequency_map, bytes)
+
+    def test_analyzer_version_default(self):
+        """Test rows created outside the API are stamped with the current analyzer version"""
+        from unittest import mock
+
+        with mock.patch('sas.utils.ANALYZER_VERSION', ANALYZER_VERSION + 1):
+            string_obj = AnalyzedString.objects.create(
+                id='x' * 64, value='x', length=1, is_palindrome=True,
+                unique_characters=1, word_count=1,
+            )
+        string_obj.refresh_from_db()
+        self.assertEqual(string_obj.analyzer_version, ANALYZER_VERSION + 1)
+
+    def test_character_frequency_cache(self):
+        """Test the decoded frequency map is cached and invalidated on change"""
+        string_obj = AnalyzedString(value="hello")
+        string_obj.set_character_frequency({'h': 1, 'e': 1, 'l': 2, 'o': 1})
+
+        freq_map = string_obj.get_character_frequency()
+        freq_map['l'] = 99
+        self.assertEqual(string_obj.get_character_frequency()['l'], 2)
+
+        string_obj.character_frequency_map = encode_character_frequency({'x': 3})
+        self.assertEqual(string_obj.get_character_frequency(), {'x': 3})
+
+        fresh = AnalyzedString(character_frequency_map=encode_character_frequency({'y': 1}))
+        self.assertEqual(fresh.get_character_frequency(), {'y': 1})
         
-    
\ No newline at end of file
+    
+class LoadTestHelperTests(TestCase):
+    def test_parse_mix(self):
+        """Test endpoint mix parsing and validation"""
+        from .management.commands.loadtest import parse_mix
+
+        self.assertEqual(parse_mix('create=2, get=1,nl'), {'create': 2.0, 'get': 1.0, 'nl': 1.0})
+        with self.assertRaises(ValueError):
+            parse_mix('delete=1')
+        with self.assertRaises(ValueError):
+            parse_mix('create=0')
+
+    def test_summarize_percentiles(self):
+        """Test per-endpoint latency percentiles and error rates"""
+        from .management.commands.loadtest import summarize
+
+        samples = [('get', 200, i / 1000) for i in range(1, 101)]
+        samples += [('create', 201, 0.01), ('create', 500, 0.02), ('create', None, 0.03), ('create', 409, 0.04)]
+        report = summarize(samples, elapsed=2)
+
+        self.assertEqual(report['get']['p50_ms'], 50)
+        self.assertEqual(report['get']['p95_ms'], 95)
+        self.assertEqual(report['get']['p99_ms'], 99)
+        self.assertEqual(report['create']['error_rate'], 0.5)
+        self.assertEqual(report['create']['non_2xx_rate'], 0.75)
+        self.assertEqual(report['total']['requests'], 104)
+        self.assertEqual(report['total']['throughput'], 52)
+        self.assertNotIn('list', report)
+
+    def test_find_saturation(self):
+        """Test saturation detection in stepped mode"""
+        from .management.commands.loadtest import find_saturation
+
+        def step(concurrency, throughput, error_rate=0.0):
+            return concurrency, {'throughput': throughput, 'error_rate': error_rate}
+
+        steps = [step(1, 100), step(2, 190), step(4, 300), step(8, 305), step(16, 250)]
+        self.assertEqual(find_saturation(steps, 0.05, 0.01), 4)
+
+        steps = [step(1, 100), step(2, 190, error_rate=0.2)]
+        self.assertEqual(find_saturation(steps, 0.05, 0.01), 1)
+
+class ReanalyzeStringsCommandTests(TestCase):
+    def test_reanalyze_stale_rows(self):
+        """Test that the backfill rewrites rows from older analyzer versions"""
+        from io import StringIO
+        from django.core.management import call_command
+
+        for text in ['madam', 'hello world', 'abc']:
+            analysis = analyze_string(text)
+            AnalyzedString.objects.create(
+                id=analysis['sha256_hash'],
+                value=text,
+                length=0,
+                is_palindrome=False,
+                unique_characters=0,
+                word_count=0,
+                character_frequency_map=b'',
+                analyzer_version=ANALYZER_VERSION - 1,
+            )
+
+        out = StringIO()
+        call_command('reanalyze_strings', chunk_size=2, stdout=out)
+
+        self.assertIn('3/3', out.getvalue())
+        self.assertFalse(AnalyzedString.objects.filter(analyzer_version__lt=ANALYZER_VERSION).exists())
+        madam = AnalyzedString.objects.get(value='madam')
+        self.assertTrue(madam.is_palindrome)
+        self.assertEqual(madam.length, 5)
+        self.assertEqual(madam.get_character_frequency()['m'], 2)
+        self.assertEqual(AnalyzedString.objects.get(value='hello world').word_count, 2)
+
+        out = StringIO()
+        call_command('reanalyze_strings', stdout=out)
+        self.assertIn('All strings are at analyzer version', out.getvalue())
@@ -1,7 +1,19 @@
 import hashlib
 import json
+import re
+import zlib
 from collections import Counter
 
+# Bump whenever the rules below change so stored rows can be found and
+# re-analyzed with `manage.py reanalyze_strings`.
+ANALYZER_VERSION = 1
+
+
+def current_analyzer_version():
+    # Model default, so rows created outside the API are stamped too. It is a
+    # callable so that bumping ANALYZER_VERSION needs no migration.
+    return ANALYZER_VERSION
+
 def analyze_string(text):
     # Basic validation
     if not isinstance(text, str):
@@ -33,4 +45,88 @@ def analyze_string(text):
         "word_count": word_count,
         "sha256_hash": sha256_hash,
         "character_frequency_map": character_frequency_map
-    }
\ No newline at end of file
+    }
+
+
+# Character frequency maps are stored as a flags byte, a varint length, the
+# characters UTF-8 encoded in first-occurrence order, then one count per
+# character: single bytes, or varints if any count is 256 or more. Large
+# alphabets are zlib-compressed when that actually saves space.
+FREQUENCY_ZLIB = 0x01
+FREQUENCY_VARINT_COUNTS = 0x02
+FREQUENCY_ZLIB_MIN_BYTES = 1024
+
+_MULTI_BYTE_VARINT = re.compile(rb'[\x80-\xff]+[\x00-\x7f]')
+
+
+def _write_varint(out, n):
+    while n >= 0x80:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def _read_varint(data, pos):
+    n = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        n |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return n, pos
+        shift += 7
+
+
+def _read_varints(body):
+    # Nearly every count fits in one byte, so copy runs of those in one go
+    # and only decode the multi-byte varints by hand.
+    values = []
+    start = 0
+    for match in _MULTI_BYTE_VARINT.finditer(body):
+        values += body[start:match.start()]
+        n = 0
+        for shift, byte in enumerate(match.group()):
+            n |= (byte & 0x7F) << (7 * shift)
+        values.append(n)
+        start = match.end()
+    values += body[start:]
+    return values
+
+
+def encode_character_frequency(freq_dict):
+    characters = ''.join(freq_dict).encode('utf-8', 'surrogatepass')
+    body = bytearray()
+    _write_varint(body, len(characters))
+    body += characters
+
+    flags = 0
+    try:
+        body += bytes(freq_dict.values())
+    except ValueError:
+        flags |= FREQUENCY_VARINT_COUNTS
+        for count in freq_dict.values():
+            _write_varint(body, count)
+
+    if len(body) >= FREQUENCY_ZLIB_MIN_BYTES:
+        compressed = zlib.compress(body)
+        if len(compressed) < len(body):
+            return bytes([flags | FREQUENCY_ZLIB]) + compressed
+    return bytes([flags]) + body
+
+
+def decode_character_frequency(data):
+    data = bytes(data)
+    if not data:
+        return {}
+
+    flags = data[0]
+    if flags & ~(FREQUENCY_ZLIB | FREQUENCY_VARINT_COUNTS):
+        raise ValueError(f"Unknown character frequency encoding {flags}")
+    body = zlib.decompress(data[1:]) if flags & FREQUENCY_ZLIB else data[1:]
+
+    size, start = _read_varint(body, 0)
+    characters = body[start:start + size].decode('utf-8', 'surrogatepass')
+    counts = body[start + size:]
+    if flags & FREQUENCY_VARINT_COUNTS:
+        counts = _read_varints(counts)
+    return dict(zip(characters, counts))
@@ -4,7 +4,7 @@ from rest_framework.response import Response
 from django.shortcuts import get_object_or_404
 from .models import AnalyzedString
 from .serializers import AnalyzedStringSerializer, StringInputSerializer
-from .utils import analyze_string
+from .utils import analyze_string, ANALYZER_VERSION
 import json
 
 @api_view(['GET'])
@@ -63,6 +63,7 @@ def create_analyze_string(request):
         is_palindrome=properties['is_palindrome'],
         unique_characters=properties['unique_characters'],
         word_count=properties['word_count'],
+        analyzer_version=ANALYZER_VERSION,
     )
     analyzed_string.set_character_frequency(properties['character_frequency_map'])
     analyzed_string.save()